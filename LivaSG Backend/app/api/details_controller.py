@@ -2,19 +2,18 @@
 
 from __future__ import annotations
 
+import json
+import math
+import os
+import sqlite3
+
 from fastapi import APIRouter, Depends, HTTPException, Query
-from ..domain.models import PriceTrend
+from ..domain.models import FacilitiesSummary, CategoryBreakdown, PriceTrend
+from ..services.rating_engine import clamp01
 from ..services.trend_service import TrendService
 
-
-
-from fastapi import APIRouter, Query
-from ..domain.models import FacilitiesSummary, PriceRecord, CategoryBreakdown
 router = APIRouter(prefix="/details", tags=["details"])
 
-def get_trend_service():
-    raise RuntimeError("TrendService not wired")
-
 @router.get("/{area_id}/breakdown", response_model=CategoryBreakdown)
 async def breakdown(area_id: str):
     """Return category breakdown.
@@ -23,7 +22,6 @@ async def breakdown(area_id: str):
     """
     # Try street-level first by checking our local street index (with normalization fallback)
     try:
-        import os, sqlite3
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
         street_db_path = os.path.join(base_dir, 'street_geocode.db')
         conn = sqlite3.connect(street_db_path)
@@ -88,9 +86,7 @@ async def street_breakdown(street_name: str) -> CategoryBreakdown:
     for Affordability and Community when available.
     Called by the main breakdown endpoint.
     """
-    import os, sqlite3, math
     from ..repositories.memory_impl import MemoryTransitRepo
-    from ..domain.models import CategoryBreakdown
 
     def haversine(lat1, lon1, lat2, lon2):
         R = 6371.0
@@ -100,9 +96,6 @@ async def street_breakdown(street_name: str) -> CategoryBreakdown:
         a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
         return 2*R*math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
 
-    def clamp01(x: float) -> float:
-        return max(0.0, min(1.0, x))
-
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
     street_db_path = os.path.join(base_dir, 'street_geocode.db')
     conn = sqlite3.connect(street_db_path)
@@ -185,7 +178,6 @@ async def street_facilities_locations(
     """Return lat/lon + metadata for facilities near a street.
     Frontend can use this to add map markers based on user's filter selection.
     """
-    import os, sqlite3, math
     from ..repositories.memory_impl import MemoryAmenityRepo, MemoryAreaRepo, MemoryTransitRepo
     
     def haversine(lat1, lon1, lat2, lon2):
@@ -273,7 +265,6 @@ async def street_facilities_locations(
             'transit': ['transit_nodes', 'transit'],
             'community': ['community_centres_locations', 'community_centres']
         }
-        import json
         # Load planning-area polygon for containment checks when in planning_area_mode
         polygon_geojson = None
         if planning_area_mode and planning_area_name:
@@ -767,8 +758,8 @@ async def street_facilities_locations(
                         nodes = MemoryTransitRepo().all()
                     except Exception:
                         try:
-                            import asyncio
-                            asyncio.get_event_loop().run_until_complete(MemoryTransitRepo.initialize())
+                            # already inside the request's event loop: await, don't spin up another
+                            await MemoryTransitRepo.initialize()
                         except Exception:
                             pass
                         try:
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException, Depends, Query
 from ..domain.models import NeighbourhoodScore
+import functools
 import inspect
 
 router = APIRouter(prefix="/map", tags=["map"])
@@ -89,10 +90,19 @@ async def choropleth(
 
     weights = weights_svc.get_active()
 
+    if hasattr(engine, "aggregate_many"):
+        # concurrent breakdowns + one save; failed areas are dropped like below
+        return await engine.aggregate_many(areas, weights)
+
+    # sync vs async aggregate() decided once, not via inspect.isawaitable per area
+    aggregate = engine.aggregate
+    if not inspect.iscoroutinefunction(aggregate):
+        aggregate = functools.partial(_maybe_call, aggregate)
+
     results: list[NeighbourhoodScore] = []
     for area_name in areas:
         try:
-            score = await _maybe_call(engine.aggregate, area_name, weights)
+            score = await aggregate(area_name, weights)
             # Defensive: some engines might return None on failure
             if score is not None:
                 results.append(score)
@@ -5,14 +5,14 @@ from ..domain.models import NeighbourhoodScore, SearchFilters, LocationResult, O
 router = APIRouter()
 
 @router.post("", response_model=List[NeighbourhoodScore])
-def search_areas(filters: SearchFilters, weightsId: str = "default"):
+async def search_areas(filters: SearchFilters, weightsId: str = "default"):
     """
     Original search function for area ranking only.
     """
     from ..main import di_search, di_weights
     areas = ["Bedok", "Tampines", "ToaPayoh", "BukitMerah"]
     w = di_weights.get_active()
-    return di_search.rank(areas, w)
+    return await di_search.rank(areas, w)
 
 @router.post("/filter", response_model=List[LocationResult])
 async def filter_locations(
@@ -44,7 +44,7 @@ async def filter_polygon_locations(filters: SearchFilters):
     return await di_search.filter_locations(filters)
 
 @router.post("/search-and-rank", response_model=List[Dict[str, Any]])
-def search_and_rank_locations(filters: SearchFilters, weightsId: str = "default"):
+async def search_and_rank_locations(filters: SearchFilters, weightsId: str = "default"):
     """
     Combined search, filter, and ranking function.
     Returns locations with their ranking scores for comprehensive results.
@@ -52,7 +52,7 @@ def search_and_rank_locations(filters: SearchFilters, weightsId: str = "default"
     try:
         from ..main import di_search, di_weights
         w = di_weights.get_active()
-        return di_search.search_and_rank(filters, w)
+        return await di_search.search_and_rank(filters, w)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in search and rank: {str(e)}")
 
@@ -27,7 +27,7 @@ def export_data(
         saved_locations = shortlist_service.get_saved_locations()
         export_data = settings_service.export_data(saved_locations)
         if save_to_disk:
-            settings_service.export_json(saved_locations, save_to_disk=True)
+            settings_service.export_json(saved_locations, save_to_disk=True, data=export_data)
         return export_data
     except Exception as e:
         print(f"Export error: {str(e)}")
@@ -12,14 +12,17 @@ from typing import Any, Dict, Iterable, Optional, Tuple
 
 try:
     import orjson as _json  
-    def _dumps(obj: Any) -> bytes: return _json.dumps(obj)
+    # numpy arrays/scalars serialize natively (no .tolist() round-trip)
+    _DUMP_OPTS = _json.OPT_SERIALIZE_NUMPY
+    def _dumps(obj: Any) -> bytes: return _json.dumps(obj, option=_DUMP_OPTS)
     def _loads(b: bytes) -> Any: return _json.loads(b)
     EXT = "orjson"
 except Exception:
    
     import json as _json_std
-    def _dumps(obj: Any) -> bytes: return _json_std.dumps(obj).encode("utf-8")
-    def _loads(b: bytes) -> Any: return _json_std.loads(b.decode("utf-8"))
+    # compact separators: noticeably smaller files for the big feature lists
+    def _dumps(obj: Any) -> bytes: return _json_std.dumps(obj, separators=(",", ":")).encode("utf-8")
+    def _loads(b: bytes) -> Any: return _json_std.loads(b)
     EXT = "json"
 
 @dataclass
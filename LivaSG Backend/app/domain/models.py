@@ -1,7 +1,9 @@
 # app/domain/models.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import date, datetime
-from typing import Dict, List, Optional
+from functools import cached_property
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 
 class FacilitiesSummary(BaseModel):
     schools: int = 0
@@ -22,6 +24,10 @@ class PriceRecord(BaseModel):
     volume: int
 
 class WeightsProfile(BaseModel):
+    # frozen: `vector` is cached on the instance, so field assignment would leave it stale
+    # (model_copy(update=...) copies the cache too; build a new profile instead)
+    model_config = ConfigDict(frozen=True)
+
     id: str = "default"
     name: str = "Default"
     wAff: float = 0.2
@@ -30,15 +36,30 @@ class WeightsProfile(BaseModel):
     wEnv: float = 0.2
     wCom: float = 0.2
 
+    @cached_property
+    def vector(self) -> np.ndarray:
+        """(wAff, wAcc, wAmen, wEnv, wCom) as a read-only float64 array, built once per profile."""
+        v = np.array([self.wAff, self.wAcc, self.wAmen, self.wEnv, self.wCom], dtype=np.float64)
+        v.flags.writeable = False
+        return v
+
 class NeighbourhoodScore(BaseModel):
     areaId: str
     total: float
     weightsProfileId: str = "default"
     computedAt: datetime = Field(default_factory=datetime.utcnow)
 
+# fixed category order for the tuple-packed scoring path
+CATEGORY_KEYS = ("Affordability", "Accessibility", "Amenities", "Environment", "Community")
+
 class CategoryBreakdown(BaseModel):
     scores: Dict[str, float]
 
+    def as_tuple(self) -> Tuple[float, float, float, float, float]:
+        """Scores in CATEGORY_KEYS order (aff, acc, amen, env, com)."""
+        s = self.scores
+        return (s["Affordability"], s["Accessibility"], s["Amenities"], s["Environment"], s["Community"])
+
 class SearchFilters(BaseModel):
     facilities: List[str] = []
     price_range: List[int] = Field(default_factory=lambda: [500000, 3000000])
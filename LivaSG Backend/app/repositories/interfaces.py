@@ -1,12 +1,14 @@
-from typing import List, Optional
-from ..domain.models import PriceRecord, FacilitiesSummary, WeightsProfile, NeighbourhoodScore, CommunityCentre, AreaCentroid
-from ..domain.models import Transit, Carpark
 from abc import ABC, abstractmethod
-from ..domain.models import RankProfile, SavedLocation
-from typing import Protocol
+from typing import Any, Dict, List, Optional, Protocol
+from ..domain.models import (
+    PriceRecord, PricePoint, FacilitiesSummary, WeightsProfile, NeighbourhoodScore, CommunityCentre,
+    AreaCentroid, Transit, Carpark, RankProfile, SavedLocation,
+)
 
-class IPriceRepo:
+class IPriceRepo(Protocol):
     def series(self, area_id: str, months: int) -> List[PriceRecord]: ...
+    def trend_points(self, area_id: str, *, since_year: int = 2017) -> List[PricePoint]: ...
+    def latest_median(self, area_id: str) -> Optional[int]: ...
 
 class IAmenityRepo:
     def facilities_summary(self, area_id: str) -> FacilitiesSummary: ...
@@ -43,11 +45,11 @@ class IWeightsRepo:
 class IScoreRepo:
     def latest(self, area_id: str, weights_id: str) -> Optional[NeighbourhoodScore]: ...
     def save(self, s: NeighbourhoodScore) -> None: ...
+    def save_many(self, scores: List[NeighbourhoodScore]) -> None:
+        for s in scores:
+            self.save(s)
 
 
-#new commit stuff
-from typing import Any, Dict, List
-
 class IPlanningAreaRepo:
     async def geojson(self, year: int = 2020) -> Dict[str, Any]: ...
     async def names(self, year: int = 2020) -> List[str]: ...
@@ -70,15 +72,9 @@ class ISavedLocationRepo(ABC):
     def delete_location(self,postal_code:str)-> None: ...
     @abstractmethod
     def get_location(self, postal_code:str)->Optional[SavedLocation]: ...
-
-# new 
-from typing import List
-from ..domain.models import PricePoint
-
-class IPriceRepo(Protocol):
-    def series(self, area_id: str, months: int) -> List["PriceRecord"]:
-        ...
-
-
-    def trend_points(self, area_id: str, *, since_year: int = 2017) -> List[PricePoint]:
-        ...
+    @abstractmethod
+    def clear(self)-> None: ...
+    @abstractmethod
+    def bulk_insert(self, locations: List[SavedLocation])-> None: ...
+    @abstractmethod
+    def replace_all(self, locations: List[SavedLocation])-> None: ...
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 # stdlib
+import asyncio
 import csv
 import math
 import os
@@ -38,8 +39,13 @@ def _parse_month(s: str) -> date:
     return date(int(y), int(m), 1)
 
 # third-party
+import numpy as np
 import requests
+import shapely
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from shapely.geometry import Point, Polygon, MultiPolygon  # FIXED import path for shapely v2
+from shapely.strtree import STRtree
 
 # local cache utils
 from ..cache.paths import cache_file
@@ -67,6 +73,24 @@ from ..integrations import onemap_client as onemap
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "86400"))  # 24h default
 DEBUG_AMEN = os.getenv("DEBUG_AMEN", "0") == "1"
 
+# cache_key -> running fetch; concurrent cold-cache callers await the same task
+_inflight: Dict[str, "asyncio.Task"] = {}
+
+_HTTP: Optional[requests.Session] = None
+
+def _http() -> requests.Session:
+    """
+    One pooled session for every data.gov.sg call, so paginated fetches reuse
+    the TCP+TLS connection instead of handshaking per page.
+    """
+    global _HTTP
+    if _HTTP is None:
+        s = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504))
+        s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+        _HTTP = s
+    return _HTTP
+
 def _cache_get(name: str, ttl: Optional[int] = None):
     p = cache_file(name, version=1)
     blob = load_cache(p)
@@ -83,17 +107,34 @@ def _cache_put(name: str, payload, extra_meta=None):
     p = cache_file(name, version=1)
     save_cache(p, payload=payload, meta=(extra_meta or {}))
 
-def _fetch_json_cached(cache_name: str, url: str, *, ttl: Optional[int] = None):
+def _fetch_json_cached(cache_name: str, url: str, *, ttl: Optional[int] = None, cache_if=None):
     cached = _cache_get(cache_name, ttl=ttl)
-    if cached is not None:
+    if cached is not None and (cache_if is None or cache_if(cached)):
         return cached
-    resp = requests.get(url, timeout=30)
+    resp = _http().get(url, timeout=30)
     resp.raise_for_status()
     data = resp.json()
-    _cache_put(cache_name, data, {"url": url})
+    if cache_if is None or cache_if(data):
+        _cache_put(cache_name, data, {"url": url})
     return data
 
 
+class DatasetPollError(RuntimeError):
+    """data.gov.sg poll-download answered with a non-zero code."""
+
+
+def _fetch_dataset(name: str, dataset_id: str):
+    """
+    poll-download -> dataset JSON, both cached under <name>_poll / <name>_dataset.
+    A failed poll is never cached, so the next call retries instead of replaying it.
+    """
+    poll_url = f"https://api-open.data.gov.sg/v1/public/api/datasets/{dataset_id}/poll-download"
+    poll_json = _fetch_json_cached(f"{name}_poll", poll_url, cache_if=lambda j: j.get('code') == 0)
+    if poll_json.get('code') != 0:
+        raise DatasetPollError(f"{name}: {poll_json.get('errMsg') or 'poll-download failed'}")
+    return _fetch_json_cached(f"{name}_dataset", poll_json['data']['url'])
+
+
 # --------------------------------------------------------------------------------------
 # CSV-backed resale price index (for MemoryPriceRepo)
 # --------------------------------------------------------------------------------------
@@ -172,6 +213,45 @@ def _load_or_build_price_index(csv_path: Path):
     return out
 
 
+def _index_by_area(items) -> Dict[str, List[int]]:
+    """
+    { areaId_lower: [positions in items] } so list_near_area is a dict hit
+    instead of a lower()-and-compare scan over every object.
+    """
+    out: Dict[str, List[int]] = defaultdict(list)
+    for i, it in enumerate(items):
+        if it.areaId:
+            out[it.areaId.lower()].append(i)
+    return dict(out)
+
+
+def _coords_by_area(items, by_area: Dict[str, List[int]]) -> Tuple[np.ndarray, np.ndarray, Dict[str, Tuple[int, int]]]:
+    """
+    Structure-of-arrays view of items' (latitude, longitude): two contiguous float64 arrays
+    grouped by area, plus { areaId_lower: (start, end) } slices into them. Items missing a
+    coordinate are dropped; items without an area go after the last group, so the full arrays
+    cover every located item.
+    """
+    lats: List[float] = []
+    lons: List[float] = []
+    slices: Dict[str, Tuple[int, int]] = {}
+    grouped = set()
+    for key, idxs in by_area.items():
+        start = len(lats)
+        for i in idxs:
+            it = items[i]
+            if it.latitude is not None and it.longitude is not None:
+                lats.append(it.latitude)
+                lons.append(it.longitude)
+        slices[key] = (start, len(lats))
+        grouped.update(idxs)
+    for i, it in enumerate(items):
+        if i not in grouped and it.latitude is not None and it.longitude is not None:
+            lats.append(it.latitude)
+            lons.append(it.longitude)
+    return np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64), slices
+
+
 # --------------------------------------------------------------------------------------
 # Repositories
 # --------------------------------------------------------------------------------------
@@ -292,6 +372,24 @@ class MemoryPriceRepo(IPriceRepo):
 
         return out
 
+    def latest_median(self, area_id: str) -> Optional[int]:
+        """
+        medianResale of the newest month, i.e. series(area_id, months=1)[-1].medianResale,
+        without building PriceRecords (or the whole synthetic fallback series). None if no data.
+        """
+        key = _norm_town(area_id)
+        rows = self._by_town.get(key)
+        if rows:
+            return int(round(rows[-1][1]))
+        # fallback: same formula as series() for its last month (CAP_DATE's month)
+        y, m = CAP_DATE.year, CAP_DATE.month
+        if (y, m) < (2018, 1):
+            return None
+        d = date(y, m, 1)
+        base = 520_000 if key == "TAMPINES" else 375_000
+        trend = ((y - 2024) * 12 + (m - 1)) * 900
+        return int(round(_det_jitter(base + trend, f"{key}:{d.isoformat()}", max_pct=0.06)))
+
 class MemoryAmenityRepo(IAmenityRepo):
     _schools_data = None
     _sports_data = None
@@ -299,19 +397,61 @@ class MemoryAmenityRepo(IAmenityRepo):
     _clinics_data = None
     _parks_data = None
     _community_data = None
+    # bumped whenever a dataset list is (re)loaded; keys the memoized snapshot id
+    _version = 0
+    _snapshot_cached: Optional[str] = None
+    _snapshot_version = -1
+    # one STRtree over every amenity point + parallel kind codes (index into _TREE_KINDS)
+    _TREE_KINDS = ("_schools_data", "_sports_data", "_hawkers_data",
+                   "_clinics_data", "_parks_data", "_community_data")
+    _tree: Optional[STRtree] = None
+    _tree_kinds: Optional[np.ndarray] = None
+    _tree_version = -1
+    # running dataset load; concurrent cold callers await the same task
+    _init_task: Optional["asyncio.Task"] = None
+
+    @classmethod
+    def _dataset_ids(cls) -> Tuple[int, ...]:
+        return tuple(map(id, (cls._schools_data, cls._sports_data, cls._hawkers_data,
+                              cls._clinics_data, cls._parks_data, cls._community_data)))
 
     @classmethod
     async def initialize(cls):
-        if cls._schools_data is None:
-            cls._schools_data = await cls.getSchools()
-        if cls._sports_data is None:
-            cls._sports_data = cls.getSportFacilities()
-        if cls._hawkers_data is None:
-            cls._hawkers_data = cls.getHawkerCentres()
-        if cls._clinics_data is None:
-            cls._clinics_data = cls.getChasClinics()
-        if cls._parks_data is None:
-            cls._parks_data = cls.getParks()
+        if None not in (cls._schools_data, cls._sports_data, cls._hawkers_data,
+                        cls._clinics_data, cls._parks_data, cls._community_data):
+            return
+        # single-flight: parallel aggregate() calls on a cold start share one load
+        task = cls._init_task
+        if task is None:
+            task = asyncio.create_task(cls._load_datasets())
+            cls._init_task = task
+            task.add_done_callback(lambda _t: setattr(cls, "_init_task", None))
+        # shield so one cancelled caller doesn't cancel the load for the others
+        await asyncio.shield(task)
+
+    @classmethod
+    async def _load_datasets(cls):
+        before = cls._dataset_ids()
+        # fetch the missing datasets side by side (blocking loaders in threads);
+        # a failed dataset is logged and left as None so the next call retries it
+        loaders = (
+            ("_schools_data", cls.getSchools),
+            ("_sports_data", cls.getSportFacilities),
+            ("_hawkers_data", cls.getHawkerCentres),
+            ("_clinics_data", cls.getChasClinics),
+            ("_parks_data", cls.getParks),
+        )
+        pending = [(attr, fn) for attr, fn in loaders if getattr(cls, attr) is None]
+        if pending:
+            results = await asyncio.gather(
+                *(fn() if asyncio.iscoroutinefunction(fn) else asyncio.to_thread(fn) for _, fn in pending),
+                return_exceptions=True,
+            )
+            for (attr, _fn), res in zip(pending, results):
+                if isinstance(res, BaseException):
+                    print(f"[AmenityRepo] {attr.strip('_')} failed to load: {res}")
+                    continue
+                setattr(cls, attr, res)
         if cls._community_data is None:
             try:
                 from .memory_impl import MemoryCommunityRepo as _MCR
@@ -328,44 +468,92 @@ class MemoryAmenityRepo(IAmenityRepo):
                 cls._community_data = items
             except Exception:
                 cls._community_data = []
+        if cls._dataset_ids() != before:
+            cls._version += 1
 
-    def _snapshot_id(self) -> str:
-        s = len(self._schools_data or [])
-        sp = len(self._sports_data or [])
-        h = len(self._hawkers_data or [])
-        c = len(self._clinics_data or [])
-        p = len(self._parks_data or [])
-        cm = len(self._community_data or [])
-        return f"s{s}-sp{sp}-h{h}-c{c}-p{p}-cm{cm}"
+    @classmethod
+    def _snapshot_id(cls) -> str:
+        if cls._snapshot_cached is not None and cls._snapshot_version == cls._version:
+            return cls._snapshot_cached
+        s = len(cls._schools_data or [])
+        sp = len(cls._sports_data or [])
+        h = len(cls._hawkers_data or [])
+        c = len(cls._clinics_data or [])
+        p = len(cls._parks_data or [])
+        cm = len(cls._community_data or [])
+        cls._snapshot_cached = f"s{s}-sp{sp}-h{h}-c{c}-p{p}-cm{cm}"
+        cls._snapshot_version = cls._version
+        return cls._snapshot_cached
 
-    async def facilities_summary(self, area_id: str) -> FacilitiesSummary:
-        await MemoryAmenityRepo.initialize()
+    @classmethod
+    def _amenity_tree(cls) -> Tuple[STRtree, np.ndarray]:
+        if cls._tree is not None and cls._tree_version == cls._version:
+            return cls._tree, cls._tree_kinds
+        coords: List[Tuple[float, float]] = []
+        kinds: List[int] = []
+        for code, attr in enumerate(cls._TREE_KINDS):
+            for loc in getattr(cls, attr) or ():
+                try:
+                    lat = float(loc.get("LATITUDE") or loc.get("latitude"))
+                    lon = float(loc.get("LONGITUDE") or loc.get("longitude"))
+                except (KeyError, ValueError, TypeError):
+                    continue
+                coords.append((lon, lat))
+                kinds.append(code)
+        cls._tree = STRtree(shapely.points(np.asarray(coords, dtype=float).reshape(-1, 2)))
+        cls._tree_kinds = np.asarray(kinds, dtype=np.intp)
+        cls._tree_version = cls._version
+        return cls._tree, cls._tree_kinds
 
-        cache_key = f"fac_summary_{area_id.title()}"
-        cached = _cache_get(cache_key, ttl=int(os.getenv("FAC_SUMMARY_TTL", "86400")))
-        if cached is not None:
-            meta = cached.get("_meta") or {}
-            if meta.get("snapshot") == self._snapshot_id():
-                d = cached["data"]
-                return FacilitiesSummary(**d)
+    @classmethod
+    def _count_inside(cls, polygon) -> np.ndarray:
+        """Per-kind amenity counts inside polygon, from a single tree query."""
+        n_kinds = len(cls._TREE_KINDS)
+        if polygon is None:
+            return np.zeros(n_kinds, dtype=np.intp)
+        tree, kinds = cls._amenity_tree()
+        # same predicate as filterInside: polygon.contains(point)
+        hit = tree.query(polygon, predicate="contains")
+        return np.bincount(kinds[hit], minlength=n_kinds)
 
-        area_repo = MemoryAreaRepo()
-        areaPolygon, _areaCentroid = area_repo.getAreaGeometry(area_id)
+    @classmethod
+    def _count_inside_many(cls, polygons: List) -> np.ndarray:
+        """(len(polygons), n_kinds) counts from one bulk tree query; None polygons count zero."""
+        n_kinds = len(cls._TREE_KINDS)
+        out = np.zeros((len(polygons), n_kinds), dtype=np.intp)
+        idx = [i for i, p in enumerate(polygons) if p is not None]
+        if not idx:
+            return out
+        tree, kinds = cls._amenity_tree()
+        # pairs[0] = position in the query array, pairs[1] = tree index
+        pairs = tree.query(np.asarray([polygons[i] for i in idx], dtype=object), predicate="contains")
+        np.add.at(out, (np.asarray(idx, dtype=np.intp)[pairs[0]], kinds[pairs[1]]), 1)
+        return out
 
-        cp_repo = MemoryCarparkRepo()
+    @staticmethod
+    def _cached_summary(area_id: str, snapshot: str) -> Optional[FacilitiesSummary]:
+        cached = _cache_get(f"fac_summary_{area_id.title()}", ttl=int(os.getenv("FAC_SUMMARY_TTL", "86400")))
+        if cached is not None:
+            meta = cached.get("_meta") or {}
+            if meta.get("snapshot") == snapshot:
+                return FacilitiesSummary(**cached["data"])
+        return None
 
+    @staticmethod
+    def _build_summary(area_id: str, counts, snapshot: str) -> FacilitiesSummary:
+        # counts in _TREE_KINDS order
+        sch, spo, haw, cli, par, com = (int(c) for c in counts)
         summary = FacilitiesSummary(
-            schools=len(self.filterInside(areaPolygon, self._schools_data)),
-            sports=len(self.filterInside(areaPolygon, self._sports_data)),
-            hawkers=len(self.filterInside(areaPolygon, self._hawkers_data)),
-            healthcare=len(self.filterInside(areaPolygon, self._clinics_data)),
-            greenSpaces=len(self.filterInside(areaPolygon, self._parks_data)),
-            carparks=len(cp_repo.list_near_area(area_id)),
-            community=len(self.filterInside(areaPolygon, self._community_data)),
+            schools=sch,
+            sports=spo,
+            hawkers=haw,
+            healthcare=cli,
+            greenSpaces=par,
+            carparks=len(MemoryCarparkRepo().list_near_area(area_id)),
+            community=com,
         )
-
-        _cache_put(cache_key, {
-            "_meta": {"snapshot": self._snapshot_id()},
+        _cache_put(f"fac_summary_{area_id.title()}", {
+            "_meta": {"snapshot": snapshot},
             "data": {
                 "schools": summary.schools,
                 "sports": summary.sports,
@@ -378,6 +566,42 @@ class MemoryAmenityRepo(IAmenityRepo):
         })
         return summary
 
+    async def facilities_summary(self, area_id: str) -> FacilitiesSummary:
+        await MemoryAmenityRepo.initialize()
+
+        snapshot = self._snapshot_id()
+        cached = self._cached_summary(area_id, snapshot)
+        if cached is not None:
+            return cached
+
+        areaPolygon, _areaCentroid = MemoryAreaRepo().getAreaGeometry(area_id)
+
+        # one spatial join for every amenity kind (order = _TREE_KINDS)
+        return self._build_summary(area_id, self._count_inside(areaPolygon), snapshot)
+
+    async def facilities_summary_bulk(self, area_ids: List[str]) -> Dict[str, FacilitiesSummary]:
+        """
+        facilities_summary for many areas: one initialize/snapshot check, and a single
+        tree query covering every uncached area polygon. Keyed by the ids as given.
+        """
+        await MemoryAmenityRepo.initialize()
+
+        snapshot = self._snapshot_id()
+        out: Dict[str, FacilitiesSummary] = {}
+        misses: List[str] = []
+        for area_id in dict.fromkeys(area_ids):
+            cached = self._cached_summary(area_id, snapshot)
+            if cached is not None:
+                out[area_id] = cached
+            else:
+                misses.append(area_id)
+        if misses:
+            area_repo = MemoryAreaRepo()
+            polygons = [area_repo.getAreaGeometry(a)[0] for a in misses]
+            for area_id, counts in zip(misses, self._count_inside_many(polygons)):
+                out[area_id] = self._build_summary(area_id, counts, snapshot)
+        return out
+
     @staticmethod
     def filterInside(polygon, locations: List[dict]) -> List[dict]:
         if polygon is None or locations is None:
@@ -403,6 +627,17 @@ class MemoryAmenityRepo(IAmenityRepo):
                 print(f"[cache] {query}: {len(cached)} results")
             return cached
 
+        # single-flight: two cold callers for the same query share one paging run
+        task = _inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(MemoryAmenityRepo._fetchAllPages(query, cache_key))
+            _inflight[cache_key] = task
+            task.add_done_callback(lambda _t, k=cache_key: _inflight.pop(k, None))
+        # shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _fetchAllPages(query: str, cache_key: str) -> List[dict]:
         all_results = []
         page = 1
         onemap_client = onemap.OneMapClientHardcoded()
@@ -426,14 +661,7 @@ class MemoryAmenityRepo(IAmenityRepo):
 
     @staticmethod
     def getSportFacilities():
-        dataset_id = "d_9b87bab59d036a60fad2a91530e10773"
-        poll_url = f"https://api-open.data.gov.sg/v1/public/api/datasets/{dataset_id}/poll-download"
-        poll_json = _fetch_json_cached("sports_poll", poll_url)
-        if poll_json.get('code') != 0:
-            print(poll_json.get('errMsg', 'poll-download failed'))
-            exit(1)
-        data_url = poll_json['data']['url']
-        location_data = _fetch_json_cached("sports_dataset", data_url)
+        location_data = _fetch_dataset("sports", "d_9b87bab59d036a60fad2a91530e10773")
         return [
             {
                 "name": f["properties"]["Description"].split("<td>")[1].split("</td>")[0],
@@ -446,14 +674,7 @@ class MemoryAmenityRepo(IAmenityRepo):
 
     @staticmethod
     def getHawkerCentres():
-        dataset_id = "d_4a086da0a5553be1d89383cd90d07ecd"
-        poll_url = f"https://api-open.data.gov.sg/v1/public/api/datasets/{dataset_id}/poll-download"
-        poll_json = _fetch_json_cached("hawkers_poll", poll_url)
-        if poll_json.get('code') != 0:
-            print(poll_json.get('errMsg'))
-            exit(1)
-        data_url = poll_json['data']['url']
-        location_data = _fetch_json_cached("hawkers_dataset", data_url)
+        location_data = _fetch_dataset("hawkers", "d_4a086da0a5553be1d89383cd90d07ecd")
         return [
             {
                 "name": f["properties"].get("NAME"),
@@ -466,14 +687,7 @@ class MemoryAmenityRepo(IAmenityRepo):
 
     @staticmethod
     def getChasClinics():
-        dataset_id = "d_548c33ea2d99e29ec63a7cc9edcccedc"
-        poll_url = f"https://api-open.data.gov.sg/v1/public/api/datasets/{dataset_id}/poll-download"
-        poll_json = _fetch_json_cached("chas_poll", poll_url)
-        if poll_json.get('code') != 0:
-            print(poll_json.get('errMsg'))
-            exit(1)
-        data_url = poll_json['data']['url']
-        location_data = _fetch_json_cached("chas_dataset", data_url)
+        location_data = _fetch_dataset("chas", "d_548c33ea2d99e29ec63a7cc9edcccedc")
         return [
             {
                 "name": f["properties"]["Description"].split("<td>")[2].split("</td>")[0],
@@ -485,14 +699,7 @@ class MemoryAmenityRepo(IAmenityRepo):
 
     @staticmethod
     def getParks():
-        dataset_id = "d_0542d48f0991541706b58059381a6eca"
-        poll_url = f"https://api-open.data.gov.sg/v1/public/api/datasets/{dataset_id}/poll-download"
-        poll_json = _fetch_json_cached("parks_poll", poll_url)
-        if poll_json.get('code') != 0:
-            print(poll_json.get('errMsg'))
-            exit(1)
-        data_url = poll_json['data']['url']
-        location_data = _fetch_json_cached("parks_dataset", data_url)
+        location_data = _fetch_dataset("parks", "d_0542d48f0991541706b58059381a6eca")
         return [
             {
                 "name": f["properties"].get("NAME"),
@@ -516,10 +723,13 @@ class MemoryScoreRepo(IScoreRepo):
         arr = [s for s in self._scores if s.areaId == area_id and s.weightsProfileId == weights_id]
         return arr[-1] if arr else None
     def save(self, s: NeighbourhoodScore) -> None: self._scores.append(s)
+    def save_many(self, scores: List[NeighbourhoodScore]) -> None: self._scores.extend(scores)
 
 
 class MemoryCommunityRepo(ICommunityRepo):
     _centres: List[CommunityCentre] = []
+    _by_area: Dict[str, List[int]] = {}
+    _version = 0   # bumped on every reload so consumers can drop derived caches
 
     def __init__(self):
         if not MemoryCommunityRepo._centres:
@@ -529,21 +739,20 @@ class MemoryCommunityRepo(ICommunityRepo):
         return [c.name for c in self._centres]
 
     def exists(self, area_id: str) -> bool:
-        return any(c.areaId and c.areaId.lower() == area_id.lower() for c in self._centres)
+        # keys were lowercased once at ingestion; one lower() for the query only
+        return area_id.lower() in self._by_area
 
     def list_near_area(self, area_id: str) -> List[CommunityCentre]:
-        return [c for c in self._centres if c.areaId and c.areaId.lower() == area_id.lower()]
+        centres = self._centres
+        return [centres[i] for i in self._by_area.get(area_id.lower(), ())]
+
+    def counts_by_area(self) -> Dict[str, int]:
+        """{ areaId_lower: number of centres } for the current snapshot (see _version)."""
+        return {k: len(v) for k, v in self._by_area.items()}
 
     @classmethod
     def updateCommunityCentres(cls):
-        dataset_id = "d_f706de1427279e61fe41e89e24d440fa"
-        poll_url = f"https://api-open.data.gov.sg/v1/public/api/datasets/{dataset_id}/poll-download"
-        poll_json = _fetch_json_cached("cc_poll", poll_url)
-        if poll_json.get('code') != 0:
-            print(poll_json.get('errMsg'))
-            exit(1)
-        data_url = poll_json['data']['url']
-        location_data = _fetch_json_cached("cc_dataset", data_url)
+        location_data = _fetch_dataset("cc", "d_f706de1427279e61fe41e89e24d440fa")
 
         communitycentres: List[CommunityCentre] = []
         for feature in location_data["features"]:
@@ -564,6 +773,8 @@ class MemoryCommunityRepo(ICommunityRepo):
                 longitude=feature["geometry"]["coordinates"][0]
             ))
         cls._centres = communitycentres
+        cls._by_area = _index_by_area(communitycentres)
+        cls._version += 1
 
 
 class MemoryTransitRepo(ITransitRepo):
@@ -573,9 +784,32 @@ class MemoryTransitRepo(ITransitRepo):
         Transit(id="mrt_tampines", type="mrt", name="Tampines MRT", areaId="Tampines", latitude=1.352, longitude=103.94),
         Transit(id="bus_marine_parade_1", type="bus", name="Marine Parade Bus Stop 1", areaId="Marine Parade", latitude=1.3005, longitude=103.9105),
     ]
+    _by_area: Dict[str, List[int]] = _index_by_area(_nodes)
+    _lats, _lons, _slices = _coords_by_area(_nodes, _by_area)
+    _version = 0   # bumped on every reload so consumers can drop derived caches
+
+    @classmethod
+    def _set_nodes(cls, nodes: List[Transit]) -> None:
+        cls._nodes = nodes
+        cls._by_area = _index_by_area(nodes)
+        cls._lats, cls._lons, cls._slices = _coords_by_area(nodes, cls._by_area)
+        cls._version += 1
 
     def list_near_area(self, area_id: str) -> List[Transit]:
-        return [n for n in self._nodes if n.areaId and n.areaId.lower() == area_id.lower()]
+        nodes = self._nodes
+        return [nodes[i] for i in self._by_area.get(area_id.lower(), ())]
+
+    def coords_near_area(self, area_id: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(lats, lons) degree views for nodes in area_id; None if the area has no nodes at all."""
+        sl = self._slices.get(area_id.lower())
+        if sl is None:
+            return None
+        s, e = sl
+        return self._lats[s:e], self._lons[s:e]
+
+    def all_coords(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(lats, lons) degree arrays for every node with coordinates."""
+        return self._lats, self._lons
 
     def all(self) -> List[Transit]:
         return list(self._nodes)
@@ -621,8 +855,9 @@ class MemoryTransitRepo(ITransitRepo):
         ttl = int(os.getenv("TRANSIT_TTL", str(7*24*3600)))
         cached = _cache_get(cache_key, ttl=ttl)
         if cached and isinstance(cached, list):
-            cls._nodes = [
-                Transit(
+            # our own cache, already validated when it was written -> skip re-validation
+            cls._set_nodes([
+                Transit.model_construct(
                     id=it.get("id"),
                     type=it.get("type"),
                     name=it.get("name"),
@@ -630,7 +865,7 @@ class MemoryTransitRepo(ITransitRepo):
                     latitude=it.get("latitude"),
                     longitude=it.get("longitude"),
                 ) for it in cached
-            ]
+            ])
             return
         await cls.updateTransits()
         _cache_put(cache_key, [
@@ -703,7 +938,7 @@ class MemoryTransitRepo(ITransitRepo):
                     if DEBUG_AMEN:
                         import traceback; traceback.print_exc()
 
-        cls._nodes = built or cls._nodes
+        cls._set_nodes(built or cls._nodes)
 
     @staticmethod
     def getBus() -> List[Transit]:
@@ -715,13 +950,15 @@ class MemoryTransitRepo(ITransitRepo):
 
 class MemoryCarparkRepo(ICarparkRepo):
     _carparks: List[Carpark] = []
+    _by_area: Dict[str, List[int]] = {}
 
     def __init__(self):
         if not MemoryCarparkRepo._carparks:
             MemoryCarparkRepo.updateCarparks()
 
     def list_near_area(self, area_id: str) -> List[Carpark]:
-        return [p for p in self._carparks if p.areaId and p.areaId.lower() == area_id.lower()]
+        parks = self._carparks
+        return [parks[i] for i in self._by_area.get(area_id.lower(), ())]
 
     def list_all(self) -> List[Carpark]:
         return list(self._carparks)
@@ -730,7 +967,8 @@ class MemoryCarparkRepo(ICarparkRepo):
     def updateCarparks(cls):
         # 1) live availability
         avail_url = "https://api.data.gov.sg/v1/transport/carpark-availability"
-        response = requests.get(avail_url, timeout=30)
+        session = _http()
+        response = session.get(avail_url, timeout=30)
         response.raise_for_status()
         carpark_data = response.json()
 
@@ -755,7 +993,7 @@ class MemoryCarparkRepo(ICarparkRepo):
             total = None
             while True:
                 url = base_url + curr_url
-                resp = requests.get(url, timeout=60)
+                resp = session.get(url, timeout=60)
                 resp.raise_for_status()
                 payload = resp.json()
                 result = payload["result"]
@@ -776,7 +1014,8 @@ class MemoryCarparkRepo(ICarparkRepo):
                 easting = float(record['x_coord'])
                 northing = float(record['y_coord'])
                 lat, lon = svy21_to_wgs84(easting, northing)
-                cls._carparks.append(Carpark(
+                # fields are already typed here; model_construct skips ~2k validations on boot
+                cls._carparks.append(Carpark.model_construct(
                     id=record['address'],
                     areaId=MemoryAreaRepo.getArea(lon, lat),
                     latitude=lat,
@@ -785,10 +1024,11 @@ class MemoryCarparkRepo(ICarparkRepo):
                 ))
             except Exception:
                 continue
+        cls._by_area = _index_by_area(cls._carparks)
 
 
 class MemoryAreaRepo(IAreaRepo):
-    _polygons: Dict[str, Polygon | MultiPolygon] = {}
+    _polygons: Dict[str, Polygon | MultiPolygon] = {}   # prepared in place (fast repeat contains)
     _centroids: Dict[str, AreaCentroid] = {}
 
     def __init__(self):
@@ -797,14 +1037,7 @@ class MemoryAreaRepo(IAreaRepo):
 
     @classmethod
     def updateArea(cls):
-        dataset_id = "d_4765db0e87b9c86336792efe8a1f7a66"
-        poll_url = f"https://api-open.data.gov.sg/v1/public/api/datasets/{dataset_id}/poll-download"
-        poll_json = _fetch_json_cached("areas_poll", poll_url)
-        if poll_json.get('code') != 0:
-            print(poll_json.get('errMsg'))
-            exit(1)
-        data_url = poll_json['data']['url']
-        location_data = _fetch_json_cached("areas_dataset", data_url)
+        location_data = _fetch_dataset("areas", "d_4765db0e87b9c86336792efe8a1f7a66")
 
         for feature in location_data['features']:
             area_name = feature["properties"]["Description"].split("<td>")[1].split("</td>")[0].title()
@@ -819,6 +1052,8 @@ class MemoryAreaRepo(IAreaRepo):
                 cls._polygons[area_name] = MultiPolygon(polygons)
             elif gtype == "Polygon":
                 cls._polygons[area_name] = Polygon(geom['coordinates'][0])
+            if area_name in cls._polygons:
+                shapely.prepare(cls._polygons[area_name])
 
             # centroid
             coords = []
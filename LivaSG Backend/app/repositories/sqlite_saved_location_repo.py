@@ -56,22 +56,55 @@ class SQLiteSavedLocationRepo(ISavedLocationRepo):
             ))
         return locations
     
-    def saved_location(self, location: SavedLocation) -> None:
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("""
+    _UPSERT_SQL = """
             INSERT OR REPLACE INTO saved_locations 
             (postal_code, address, area, name, notes, saved_at)
             VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        """
+
+    @staticmethod
+    def _row(location: SavedLocation) -> tuple:
+        return (
             location.postal_code,
             location.address,
             location.area,
             location.name,
             location.notes,
             location.saved_at.isoformat() if location.saved_at else datetime.now().isoformat()
-        ))
+        )
+
+    def saved_location(self, location: SavedLocation) -> None:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(self._UPSERT_SQL, self._row(location))
+        conn.commit()
+        conn.close()
+
+    def bulk_insert(self, locations: List[SavedLocation]) -> None:
+        """Upsert many locations with one executemany / one commit."""
+        if not locations:
+            return
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany(self._UPSERT_SQL, [self._row(loc) for loc in locations])
         conn.commit()
         conn.close()
+
+    def clear(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM saved_locations")
+        conn.commit()
+        conn.close()
+
+    def replace_all(self, locations: List[SavedLocation]) -> None:
+        """Clear + insert in one transaction: either the new set lands or the old one stays."""
+        rows = [self._row(loc) for loc in locations]
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:  # BEGIN ... COMMIT, ROLLBACK on error
+                conn.execute("DELETE FROM saved_locations")
+                if rows:
+                    conn.executemany(self._UPSERT_SQL, rows)
+        finally:
+            conn.close()
     
     def delete_location(self, postal_code: str) -> None:
         conn = sqlite3.connect(self.db_path)
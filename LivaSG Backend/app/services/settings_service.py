@@ -11,6 +11,27 @@ import os
 from ..domain.models import ExportData, WeightsProfile, ImportRequest, RankProfile, SavedLocation
 from ..repositories.interfaces import IWeightsRepo, IRankRepo
 
+try:
+    import orjson as _orjson
+    def _json_loads(b: Any) -> Any: return _orjson.loads(b)   # str or bytes, no decode step
+    def _json_dumps_pretty(obj: Any) -> str: return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2).decode("utf-8")
+except Exception:
+    def _json_loads(b: Any) -> Any: return json.loads(b)
+    def _json_dumps_pretty(obj: Any) -> str: return json.dumps(obj, indent=2)
+
+# CSV import lookup tables (section headings, skipped rows, category -> model field)
+_CSV_SECTIONS = {"ranks": "ranks", "weights": "weights", "saved locations": "locations"}
+_CSV_SKIP_ROWS = {"export type", "export date"}
+_CSV_SECTION_HEADERS = {"ranks": "category", "weights": "category", "locations": "postal code"}
+_RANK_FIELDS = {
+    "affordability": "rAff", "accessibility": "rAcc", "amenities": "rAmen",
+    "environment": "rEnv", "community": "rCom",
+}
+_WEIGHT_FIELDS = {
+    "affordability": "wAff", "accessibility": "wAcc", "amenities": "wAmen",
+    "environment": "wEnv", "community": "wCom",
+}
+
 class SettingsService:
     def __init__(
             self,
@@ -50,7 +71,8 @@ class SettingsService:
             except Exception:
                 pass
 
-            export_data = ExportData(
+            # all parts are already-validated models from the repos
+            export_data = ExportData.model_construct(
                 ranks=ranks,
                 saved_locations=saved_locations,
                 weights=weights,
@@ -61,9 +83,11 @@ class SettingsService:
         except Exception as e:
             raise ValueError(f"Failed to export data: {str(e)}")
 
-    def export_json(self, saved_locations: List[SavedLocation], save_to_disk: bool = True) -> Dict[str, Any]:
+    def export_json(self, saved_locations: List[SavedLocation], save_to_disk: bool = True,
+                    data: Optional[ExportData] = None) -> Dict[str, Any]:
+        """Pass `data` (an export_data() result) to reuse it instead of re-reading the repos."""
         try:
-            export_data = self.export_data(saved_locations)
+            export_data = data if data is not None else self.export_data(saved_locations)
             
             data_dict = {
                 "ranks": {
@@ -97,9 +121,8 @@ class SettingsService:
             }
             
             if save_to_disk:
-                import json
-                json_string = json.dumps(data_dict, indent=2)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                json_string = _json_dumps_pretty(data_dict)
+                timestamp = export_data.export_date.strftime("%Y%m%d_%H%M%S")
                 filename = f"livasg_export_{timestamp}.json"
                 saved_path = self._save_export_to_disk(json_string, filename, "json")
                 if saved_path:
@@ -109,56 +132,63 @@ class SettingsService:
         except Exception as e:
             raise ValueError(f"Failed to export JSON: {str(e)}")
 
-    def export_csv(self, saved_locations: List[SavedLocation], save_to_disk: bool = True) -> str:
+    def export_csv(self, saved_locations: List[SavedLocation], save_to_disk: bool = True,
+                   data: Optional[ExportData] = None) -> str:
+        """Pass `data` (an export_data() result) to reuse it instead of re-reading the repos."""
         try:
-            export_data = self.export_data(saved_locations)
+            export_data = data if data is not None else self.export_data(saved_locations)
             output = StringIO()
             writer = csv.writer(output)
             
-            writer.writerow(["Export Type", "LivaSG Data Export"])
-            writer.writerow(["Export Date", datetime.now().isoformat()])
-            writer.writerow([])
-            
-            writer.writerow(["Ranks"])
-            writer.writerow(["Category", "Rank"])
-            if export_data.ranks:
-                writer.writerow(["Affordability", export_data.ranks.rAff])
-                writer.writerow(["Accessibility", export_data.ranks.rAcc])
-                writer.writerow(["Amenities", export_data.ranks.rAmen])
-                writer.writerow(["Environment", export_data.ranks.rEnv])
-                writer.writerow(["Community", export_data.ranks.rCom])
+            ranks = export_data.ranks
+            weights = export_data.weights
+            rows: List[List[Any]] = [
+                ["Export Type", "LivaSG Data Export"],
+                ["Export Date", export_data.export_date.isoformat()],
+                [],
+                ["Ranks"],
+                ["Category", "Rank"],
+            ]
+            if ranks:
+                rows += [
+                    ["Affordability", ranks.rAff],
+                    ["Accessibility", ranks.rAcc],
+                    ["Amenities", ranks.rAmen],
+                    ["Environment", ranks.rEnv],
+                    ["Community", ranks.rCom],
+                ]
             else:
-                writer.writerow(["No ranks data available"])
-            writer.writerow([])
-            
-            writer.writerow(["Weights"])
-            writer.writerow(["Category", "Weight"])
-            if export_data.weights:
-                writer.writerow(["Affordability", export_data.weights.wAff])
-                writer.writerow(["Accessibility", export_data.weights.wAcc])
-                writer.writerow(["Amenities", export_data.weights.wAmen])
-                writer.writerow(["Environment", export_data.weights.wEnv])
-                writer.writerow(["Community", export_data.weights.wCom])
+                rows.append(["No ranks data available"])
+            rows += [[], ["Weights"], ["Category", "Weight"]]
+            if weights:
+                rows += [
+                    ["Affordability", weights.wAff],
+                    ["Accessibility", weights.wAcc],
+                    ["Amenities", weights.wAmen],
+                    ["Environment", weights.wEnv],
+                    ["Community", weights.wCom],
+                ]
             else:
-                writer.writerow(["No weights data available"])
-            writer.writerow([])
-            
-            writer.writerow(["Saved Locations"])
-            writer.writerow(["Postal Code", "Address", "Area", "Name", "Notes", "Saved At"])
-            for location in export_data.saved_locations:
-                writer.writerow([
+                rows.append(["No weights data available"])
+            rows += [[], ["Saved Locations"], ["Postal Code", "Address", "Area", "Name", "Notes", "Saved At"]]
+            rows += [
+                [
                     location.postal_code,
                     location.address,
                     location.area,
                     location.name or "",
                     location.notes or "",
                     location.saved_at.isoformat() if location.saved_at else ""
-                ])
+                ]
+                for location in export_data.saved_locations
+            ]
+            # one writerows call: the row loop runs inside the csv C module
+            writer.writerows(rows)
             
             csv_data = output.getvalue()
             
             if save_to_disk:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = export_data.export_date.strftime("%Y%m%d_%H%M%S")
                 filename = f"livasg_export_{timestamp}.csv"
                 saved_path = self._save_export_to_disk(csv_data, filename, "csv")
                 if saved_path:
@@ -193,25 +223,22 @@ class SettingsService:
             print(f"DEBUG: First 100 chars: {json_data[:100]}")
             
             data = None
-            
+
+            # Pick the decoder up front instead of using exceptions as control flow:
+            # plain JSON (what the frontend uploads) starts with { or [, anything else is base64.
             try:
-                print("DEBUG: Trying base64 decode...")
-                if json_data.startswith('data:application/json;base64,'):
-                    json_data = json_data.split(',', 1)[1]
-                
-                decoded_data = base64.b64decode(json_data).decode('utf-8')
-                data = json.loads(decoded_data)
-                print("DEBUG: Successfully decoded base64 JSON")
-            except Exception as e1:
-                print(f"DEBUG: Base64 decode failed: {e1}")
-                
-                try:
-                    print("DEBUG: Trying raw JSON parse...")
-                    data = json.loads(json_data)
-                    print("DEBUG: Successfully parsed raw JSON")
-                except Exception as e2:
-                    print(f"DEBUG: Raw JSON parse failed: {e2}")
-                    return {"success": False, "message": f"Invalid JSON data format: {e2}"}
+                stripped = json_data.lstrip()
+                if stripped[:1] in ("{", "["):
+                    data = _json_loads(stripped)
+                    print("DEBUG: Parsed raw JSON")
+                else:
+                    if stripped.startswith('data:application/json;base64,'):
+                        stripped = stripped.split(',', 1)[1]
+                    data = _json_loads(base64.b64decode(stripped))
+                    print("DEBUG: Decoded base64 JSON")
+            except Exception as e:
+                print(f"DEBUG: JSON parse failed: {e}")
+                return {"success": False, "message": f"Invalid JSON data format: {e}"}
 
             if not data:
                 return {"success": False, "message": "No data found in import"}
@@ -242,22 +269,23 @@ class SettingsService:
             if 'saved_locations' in data and shortlist_service:
                 print("DEBUG: Importing saved locations")
                 try:
-                    shortlist_service.clear_all_locations() #remove if you want the import to append instead!!
                     locations_data = data['saved_locations']
                     if isinstance(locations_data, list):
+                        pending: List[SavedLocation] = []
                         for loc_data in locations_data:
                             try:
-                                location_data = {
+                                pending.append(shortlist_service.build_location({
                                     'postal_code': loc_data['postal_code'],
                                     'address': loc_data['address'],
                                     'area': loc_data['area'],
                                     'name': loc_data.get('name'),
                                     'notes': loc_data.get('notes')
-                                }
-                                shortlist_service.save_location(location_data)
-                                imported_count += 1
+                                }))
                             except Exception as e:
                                 messages.append(f"Failed to import location {loc_data.get('postal_code', 'unknown')}: {str(e)}")
+                        # clear + bulk write in one transaction (use save_locations to append instead)
+                        shortlist_service.replace_locations(pending)
+                        imported_count += len(pending)
                         messages.append(f"Imported {len(locations_data)} saved locations")
                 except Exception as e:
                     messages.append(f"Failed to import saved locations: {str(e)}")
@@ -329,17 +357,17 @@ class SettingsService:
             print(f"DEBUG: CSV data length after processing: {len(processed_csv_data)}")
             print(f"DEBUG: CSV preview: {processed_csv_data[:200]}")
 
-            reader = csv.reader(StringIO(processed_csv_data))
-            lines = list(reader)
             current_section = None
             ranks_data = {}
             weights_data = {}
             imported_count = 0
             imported_items = []
-            
-            print(f"DEBUG: CSV has {len(lines)} lines")
+            pending_locations: List[SavedLocation] = []
+            clear_locations = False
+            line_num = -1
 
-            for line_num, line in enumerate(lines):
+            # single streaming pass over the reader (no list(reader) copy of the file)
+            for line_num, line in enumerate(csv.reader(StringIO(processed_csv_data))):
                 if not line or not any(cell.strip() for cell in line):
                     continue
                 
@@ -352,75 +380,44 @@ class SettingsService:
                     
                 first_cell = cleaned_line[0].lower()
                 
-                # Improved section detection
-                if first_cell == "ranks":
-                    current_section = "ranks"
-                    print("DEBUG: Entering Ranks section")
-                    continue
-                elif first_cell == "weights":
-                    current_section = "weights"
-                    print("DEBUG: Entering Weights section")
-                    continue
-                elif "saved locations" in first_cell:
-                    # Clear existing locations only when we enter this section
-                    try:
-                        shortlist_service.clear_all_locations()
-                    except Exception as e:
-                        print(f"DEBUG: Failed to clear locations: {e}")
-                    current_section = "locations"
-                    print("DEBUG: Entering Saved Locations section")
-                    continue
-                elif first_cell in ["export type", "export date"]:
+                # Section detection: one dict lookup instead of an if/elif cascade
+                section = _CSV_SECTIONS.get(first_cell)
+                if section is not None:
+                    current_section = section
+                    if section == "locations":
+                        # Clear existing locations only when the file has this section
+                        clear_locations = True
+                    print(f"DEBUG: Entering {cleaned_line[0]} section")
                     continue
-                elif current_section == "ranks" and first_cell == "category":
-                    # Skip the header row in ranks section
-                    continue
-                elif current_section == "weights" and first_cell == "category":
-                    # Skip the header row in weights section
-                    continue
-                elif current_section == "locations" and first_cell == "postal code":
-                    # Skip the header row in locations section
+                if first_cell in _CSV_SKIP_ROWS or first_cell == _CSV_SECTION_HEADERS.get(current_section):
+                    # Export metadata rows / the header row of the current section
                     continue
                 
                 # Process data based on current section
                 if current_section == "ranks" and len(cleaned_line) >= 2:
-                    category = cleaned_line[0].lower()
+                    category = first_cell
                     rank_value = cleaned_line[1]
                     print(f"DEBUG: Processing rank category: {category} = {rank_value}")
                     
                     try:
                         rank_int = int(rank_value)
-                        if "affordability" in category:
-                            ranks_data['rAff'] = rank_int
-                        elif "accessibility" in category:
-                            ranks_data['rAcc'] = rank_int
-                        elif "amenities" in category:
-                            ranks_data['rAmen'] = rank_int
-                        elif "environment" in category:
-                            ranks_data['rEnv'] = rank_int
-                        elif "community" in category:
-                            ranks_data['rCom'] = rank_int
+                        field = _RANK_FIELDS.get(category)
+                        if field:
+                            ranks_data[field] = rank_int
                         print(f"DEBUG: Set {category} to {rank_int}")
                     except ValueError:
                         print(f"DEBUG: Invalid rank value: {rank_value}")
                         
                 elif current_section == "weights" and len(cleaned_line) >= 2:
-                    category = cleaned_line[0].lower()
+                    category = first_cell
                     weight_value = cleaned_line[1]
                     print(f"DEBUG: Processing weight category: {category} = {weight_value}")
                     
                     try:
                         weight_float = float(weight_value)
-                        if "affordability" in category:
-                            weights_data['wAff'] = weight_float
-                        elif "accessibility" in category:
-                            weights_data['wAcc'] = weight_float
-                        elif "amenities" in category:
-                            weights_data['wAmen'] = weight_float
-                        elif "environment" in category:
-                            weights_data['wEnv'] = weight_float
-                        elif "community" in category:
-                            weights_data['wCom'] = weight_float
+                        field = _WEIGHT_FIELDS.get(category)
+                        if field:
+                            weights_data[field] = weight_float
                         print(f"DEBUG: Set {category} weight to {weight_float}")
                     except ValueError:
                         print(f"DEBUG: Invalid weight value: {weight_value}")
@@ -433,22 +430,33 @@ class SettingsService:
                             'postal_code': line[0].strip() if len(line) > 0 else "",
                             'address': line[1].strip() if len(line) > 1 else "",
                             'area': line[2].strip() if len(line) > 2 else "",
-                            'name': line[3].strip() if len(line) > 3 and line[3].strip() else None,
-                            'notes': line[4].strip() if len(line) > 4 and line[4].strip() else None
+                            'name': (line[3].strip() or None) if len(line) > 3 else None,
+                            'notes': (line[4].strip() or None) if len(line) > 4 else None
                         }
                         
                         # Validate required fields
                         if location_data['postal_code'] and location_data['address'] and location_data['area']:
-                            shortlist_service.save_location(location_data)
-                            imported_count += 1
+                            pending_locations.append(shortlist_service.build_location(location_data))
                             imported_items.append(f"Location: {location_data['postal_code']}")
-                            print(f"DEBUG: Successfully imported location: {location_data['postal_code']}")
+                            print(f"DEBUG: Parsed location: {location_data['postal_code']}")
                         else:
                             print(f"DEBUG: Skipping invalid location - missing required fields: {location_data}")
                     except Exception as e:
                         print(f"DEBUG: Failed to import location: {e}")
                         imported_items.append(f"Failed to import location: {str(e)}")
         
+            print(f"DEBUG: CSV had {line_num + 1} lines")
+
+            # saved locations: one transactional replace instead of 2N repo calls. Rows are only collected
+            # inside a "Saved Locations" section, and that section always replaces the existing set
+            if shortlist_service and clear_locations:
+                try:
+                    shortlist_service.replace_locations(pending_locations)
+                    imported_count += len(pending_locations)
+                except Exception as e:
+                    print(f"DEBUG: Failed to import locations: {e}")
+                    imported_items.append(f"Failed to import locations: {str(e)}")
+
             print(f"DEBUG: Final ranks data: {ranks_data}")
             print(f"DEBUG: Final weights data: {weights_data}")
             
@@ -14,26 +14,45 @@ class ShortlistService:
         except Exception as e:
             return []
 
+    @staticmethod
+    def build_location(location_data: Dict[str, Any]) -> SavedLocation:
+        """Validate a location dict and turn it into a SavedLocation (no repo write)"""
+        required_fields = ["postal_code", "address", "area"]
+        for field in required_fields:
+            if field not in location_data:
+                raise ValueError(f"Missing required field: {field}")
+
+        return SavedLocation(
+            postal_code=location_data["postal_code"],
+            address=location_data["address"],
+            area=location_data["area"],
+            name=location_data.get("name"),
+            notes=location_data.get("notes")
+        )
+
     def save_location(self, location_data: Dict[str, Any]) -> SavedLocation:
         """Save a location to shortlist"""
         try:
-            required_fields = ["postal_code", "address", "area"]
-            for field in required_fields:
-                if field not in location_data:
-                    raise ValueError(f"Missing required field: {field}")
-
-            location = SavedLocation(
-                postal_code=location_data["postal_code"],
-                address=location_data["address"],
-                area=location_data["area"],
-                name=location_data.get("name"),
-                notes=location_data.get("notes")
-            )
+            location = self.build_location(location_data)
             self.saved_location_repo.saved_location(location)
             return location
         except Exception as e:
             raise ValueError(f"Failed to save location: {str(e)}")
 
+    def save_locations(self, locations: List[SavedLocation]) -> None:
+        """Save many already-built locations in one repo call"""
+        try:
+            self.saved_location_repo.bulk_insert(locations)
+        except Exception as e:
+            raise ValueError(f"Failed to save locations: {str(e)}")
+
+    def replace_locations(self, locations: List[SavedLocation]) -> None:
+        """Replace all saved locations with `locations` atomically"""
+        try:
+            self.saved_location_repo.replace_all(locations)
+        except Exception as e:
+            raise ValueError(f"Failed to replace locations: {str(e)}")
+
     def delete_saved_location(self, postal_code: str) -> None:
         """Delete a saved location by postal code"""
         try:
@@ -50,8 +69,6 @@ class ShortlistService:
         
     def clear_all_locations(self) -> None:
         try:
-            locations = self.get_saved_locations()
-            for location in locations:
-                self.delete_saved_location(location.postal_code)
+            self.saved_location_repo.clear()
         except Exception as e:
             raise ValueError(f"Failed to clear locations: {str(e)}")
\ No newline at end of file
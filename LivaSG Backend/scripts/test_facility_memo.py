@@ -0,0 +1,83 @@
+"""
+Check that street facility counts are memoized per point: a repeat search for the same streets
+must be served from SearchService._facility_counts_memo instead of recounting.
+Runs against temporary copies of the cache DBs with an offline OneMap stub (no network, no writes
+to the real databases).
+"""
+import asyncio
+import shutil
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.services.search_service as search_service
+from app.domain.models import SearchFilters, OneMapSearchResponse, OneMapSearchResult
+
+STREETS = ["ADMIRALTY RD", "AH HOOD RD"]
+SENTINEL = 987654
+
+
+class OfflineOneMap:
+    """Serves the query from the local street table; planning-area lookups fail (polygon fallback)."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def planning_areas(self, year=2019):
+        raise RuntimeError("offline")
+
+    async def planning_area_at(self, lat, lon):
+        raise RuntimeError("offline")
+
+    async def search(self, query, page=1):
+        results = [
+            OneMapSearchResult(SEARCHVAL=name, ROAD_NAME=name, ADDRESS=name, LATITUDE=str(lat), LONGITUDE=str(lon))
+            for name, lat, lon in self.rows
+        ]
+        return OneMapSearchResponse(found=len(results), totalNumPages=1, pageNum=1, results=results).model_dump()
+
+
+async def main(root: Path):
+    conn = sqlite3.connect(root / "street_geocode.db")
+    rows = conn.execute(
+        f"SELECT street_name, latitude, longitude FROM street_locations WHERE street_name IN ({','.join('?' * len(STREETS))})",
+        STREETS
+    ).fetchall()
+    conn.close()
+    if len(rows) != len(STREETS):
+        print(f"❌ Test streets missing from street_geocode.db: {STREETS}")
+        raise SystemExit(1)
+
+    svc = search_service.SearchService(None, onemap_client=OfflineOneMap(rows))
+    filters = SearchFilters(search_query="RD", facilities=[])
+
+    # 1) first search computes the counts and memoizes them under (lat, lon, radius_km)
+    await svc.filter_locations(filters, view_type="street")
+    memo = svc._facility_counts_memo
+    expected = {(float(lat), float(lon), 1.0) for _, lat, lon in rows}
+    assert set(memo) == expected, f"memo keys {sorted(memo)} != {sorted(expected)}"
+    print(f"✓ memo keyed by point: {len(memo)} entries")
+
+    # 2) repeat search: a marked memo entry must come back as the persisted count
+    name, lat, lon = rows[0]
+    memo[(float(lat), float(lon), 1.0)]["schools"] = SENTINEL
+    await svc.filter_locations(filters, view_type="street")
+    assert set(memo) == expected, "repeat search added memo entries"
+    conn = sqlite3.connect(root / "street_geocode.db")
+    schools = conn.execute("SELECT schools FROM street_facilities WHERE street_name = ?", (name,)).fetchone()[0]
+    conn.close()
+    assert schools == SENTINEL, f"{name}: repeat search recounted ({schools}) instead of using the memo"
+    print(f"✓ repeat search for {name} served from the memo")
+    print("✅ Facility count memo test passed")
+
+
+if __name__ == "__main__":
+    backend = Path(__file__).parent.parent
+    with tempfile.TemporaryDirectory() as tmp:
+        for db in ("street_geocode.db", "planning_cache.db"):
+            shutil.copy(backend / db, tmp)
+        search_service._BACKEND_ROOT = tmp
+        asyncio.run(main(Path(tmp)))